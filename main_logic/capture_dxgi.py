@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Foreground capture via the DXGI Desktop Duplication API (through dxcam).
+Frames come from the compositor's GPU surface instead of a GDI BitBlt.
+Requires: dxcam, numpy, opencv-python (optional: OpenCV built with CUDA for grab_gpu)
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    import dxcam
+except ImportError as e:
+    raise SystemExit("dxcam is required: pip install dxcam") from e
+
+try:
+    import cv2
+except ImportError as e:
+    raise SystemExit("opencv-python is required: pip install opencv-python") from e
+
+from .benchmark import measure_fps
+
+
+def _cuda_available() -> bool:
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except Exception:
+        return False
+
+
+class DXGICapture:
+    """
+    Same grab(bbox) contract as MSSCapture. Duplicates the primary monitor, whose
+    desktop origin is (0, 0), so screen-coordinate bboxes map onto it directly.
+    The bbox must lie entirely on the primary monitor.
+    """
+
+    def __init__(self, timeout_s: float = 0.1) -> None:
+        # No output_idx: dxcam then picks the primary output
+        self._cam = dxcam.create(output_color="BGR")
+        if self._cam is None:
+            raise RuntimeError("dxcam could not create a duplication for the primary output")
+        self.timeout_s = timeout_s
+        # True when the last grab() returned the previous frame (screen unchanged)
+        self.stale = False
+        self._last: Optional[np.ndarray] = None
+        self._gpu = cv2.cuda_GpuMat() if _cuda_available() else None
+
+    def _region(self, bbox: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+        left, top, width, height = bbox
+        right, bottom = left + width, top + height
+        if left < 0 or top < 0 or right > self._cam.width or bottom > self._cam.height:
+            raise RuntimeError(
+                f"Capture bbox {bbox} is not fully on the primary monitor "
+                f"({self._cam.width}x{self._cam.height}); use the mss backend"
+            )
+        return left, top, right, bottom
+
+    def grab(self, bbox: Tuple[int, int, int, int]) -> np.ndarray:
+        """
+        Desktop Duplication only delivers a frame when the screen changed. Waits up to
+        timeout_s for one; if none arrives, returns the previous frame with self.stale
+        set. Raises TimeoutError if there is no previous frame of this size.
+        """
+        region = self._region(bbox)
+        frame = self._cam.grab(region=region)
+        if frame is None:
+            deadline = time.perf_counter() + self.timeout_s
+            while frame is None and time.perf_counter() < deadline:
+                time.sleep(0.001)
+                frame = self._cam.grab(region=region)
+        if frame is None:
+            if self._last is not None and self._last.shape[:2] == (bbox[3], bbox[2]):
+                self.stale = True
+                return self._last
+            raise TimeoutError(f"No DXGI frame within {self.timeout_s}s")
+        self.stale = False
+        self._last = frame
+        return frame
+
+    def grab_gpu(self, bbox: Tuple[int, int, int, int]):
+        """
+        Grab and upload into a reused cv2.cuda_GpuMat for GPU-side processing.
+        Falls back to the CPU ndarray when OpenCV has no CUDA support.
+        """
+        frame = self.grab(bbox)
+        if self._gpu is None:
+            return frame
+        self._gpu.upload(frame)
+        return self._gpu
+
+    def close(self) -> None:
+        if self._cam is not None:
+            self._cam.release()
+            self._cam = None
+
+    def benchmark(self, bbox: Tuple[int, int, int, int], seconds: float = 3.0) -> float:
+        def grab_once() -> bool:
+            self.grab(bbox)
+            return not self.stale  # repeats of an unchanged screen are not frames
+        return measure_fps(grab_once, seconds)
@@ -6,8 +6,7 @@ Requires: mss, numpy, opencv-python
 
 from __future__ import annotations
 
-import time
-from typing import Tuple
+from typing import Optional, Tuple
 
 import numpy as np
 
@@ -21,23 +20,34 @@ try:
 except ImportError as e:
     raise SystemExit("opencv-python is required: pip install opencv-python") from e
 
+from .benchmark import measure_fps
+
 
 class MSSCapture:
-    def __init__(self) -> None:
+    def __init__(self, bbox_hint: Optional[Tuple[int, int, int, int]] = None) -> None:
         self._sct = mss.mss()
+        # Reused BGR output buffer; (re)allocated only when the grab size changes
+        self._out: Optional[np.ndarray] = None
+        if bbox_hint is not None:
+            self._out = np.empty((bbox_hint[3], bbox_hint[2], 3), dtype=np.uint8)
 
     def grab(self, bbox: Tuple[int, int, int, int]) -> np.ndarray:
+        """
+        Capture bbox as a BGR frame. The returned array is an internal buffer
+        that is overwritten by the next grab(); copy it if it must be kept.
+        """
         left, top, width, height = bbox
         monitor = {"left": left, "top": top, "width": width, "height": height}
         sct_img = self._sct.grab(monitor)
-        frame = np.asarray(sct_img, dtype=np.uint8)[..., :3]  # BGRA->BGR
-        return frame
+        h, w = sct_img.height, sct_img.width
+        bgra = np.frombuffer(sct_img.raw, dtype=np.uint8).reshape(h, w, 4)
+        if self._out is None or self._out.shape[:2] != (h, w):
+            self._out = np.empty((h, w, 3), dtype=np.uint8)
+        cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=self._out)
+        return self._out
 
     def benchmark(self, bbox: Tuple[int, int, int, int], seconds: float = 3.0) -> float:
-        t0 = time.perf_counter()
-        frames = 0
-        while (time.perf_counter() - t0) < seconds:
-            _ = self.grab(bbox)
-            frames += 1
-        elapsed = time.perf_counter() - t0
-        return frames / elapsed if elapsed > 0 else 0.0
+        def grab_once() -> bool:
+            self.grab(bbox)
+            return True
+        return measure_fps(grab_once, seconds)
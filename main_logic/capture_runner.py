@@ -1,18 +1,21 @@
 # -*- coding: utf-8 -*-
 """
-Runner to capture the MTA window using MSS (fast, foreground) or Win32 (occlusion-tolerant).
+Runner to capture the MTA window using MSS (fast, foreground), DXGI Desktop Duplication
+(fastest, foreground, needs dxcam) or Win32 (occlusion-tolerant).
 Usage:
   python -m main_logic.capture_runner --backend mss --save screenshots/test_mss.png
   python -m main_logic.capture_runner --backend mss --preview
+  python -m main_logic.capture_runner --backend dxgi --preview
   python -m main_logic.capture_runner --backend win32 --preview
 """
 
 from __future__ import annotations
 
 import argparse
+import threading
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Optional
 
 import numpy as np
 
@@ -26,74 +29,165 @@ from .capture_mss import MSSCapture
 from .capture_win32 import Win32ClientCapture
 
 
-def _overlay_fps(frame: np.ndarray, fps: float, backend: str, title: str) -> np.ndarray:
-    out = frame.copy()
-    text = f"{backend} | {fps:.1f} FPS | {title}"
-    cv2.putText(out, text, (10, 22), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2, cv2.LINE_AA)
-    return out
+class _FpsOverlay:
+    """
+    FPS label rendered once into a small sprite and blitted onto each frame.
+    The text is re-rasterized at most every `update_s` seconds, and only if it changed.
+    """
+
+    def __init__(self, backend: str, title: str, update_s: float = 0.1) -> None:
+        self.backend = backend
+        self.title = title
+        self.update_s = update_s
+        self._text: Optional[str] = None
+        self._sprite: Optional[np.ndarray] = None
+        self._mask: Optional[np.ndarray] = None
+        self._next_update = 0.0
+
+    def _render(self, text: str) -> None:
+        (tw, th), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+        sprite = np.zeros((22 + baseline + 2, 10 + tw + 2, 3), dtype=np.uint8)
+        cv2.putText(sprite, text, (10, 22), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2, cv2.LINE_AA)
+        self._text = text
+        self._sprite = sprite
+        self._mask = sprite.any(axis=2, keepdims=True)
+
+    def apply(self, frame: np.ndarray, fps: float) -> np.ndarray:
+        now = time.perf_counter()
+        if now >= self._next_update:
+            text = f"{self.backend} | {fps:.1f} FPS | {self.title}"
+            if text != self._text:
+                self._render(text)
+            self._next_update = now + self.update_s
+        # Drawn in place: callers discard the frame after display
+        h = min(self._sprite.shape[0], frame.shape[0])
+        w = min(self._sprite.shape[1], frame.shape[1])
+        np.copyto(frame[:h, :w], self._sprite[:h, :w], where=self._mask[:h, :w])
+        return frame
+
+def _preview(
+    make_cap: Callable[[], Any],
+    grab: Callable[[Any], np.ndarray],
+    label: str,
+    title: str,
+) -> None:
+    """
+    Capture on a producer thread while the main thread overlays and displays,
+    so imshow/waitKey never hold up the next grab. The producer creates its own
+    capture object (MSS handles are thread-bound) and publishes the latest frame.
+    """
+    slot_lock = threading.Lock()
+    slot = {"frame": None, "fps": 0.0, "error": None}
+    ready = threading.Event()
+    running = threading.Event()
+    running.set()
+
+    def producer() -> None:
+        try:
+            cap = make_cap()
+            # Two publish buffers: the display thread holds the last published one,
+            # the producer fills the other. Backends reuse their own output buffer,
+            # so frames are copied out, but only when the display has taken the
+            # previous one (ready clear) -- skipped grabs cost no copy.
+            bufs: list = [None, None]
+            back = 0
+            t0 = time.perf_counter()
+            frames = 0
+            while running.is_set():
+                frame = grab(cap)
+                if getattr(cap, "stale", False):
+                    continue  # DXGI: screen unchanged, no new frame to count or show
+                frames += 1
+                elapsed = time.perf_counter() - t0
+                fps = frames / elapsed if elapsed > 0 else 0.0
+                if ready.is_set():
+                    continue
+                buf = bufs[back]
+                if buf is None or buf.shape != frame.shape:
+                    buf = bufs[back] = np.empty_like(frame)
+                np.copyto(buf, frame)
+                with slot_lock:
+                    slot["frame"] = buf
+                    slot["fps"] = fps
+                    ready.set()
+                back ^= 1
+        except BaseException as e:
+            # Includes SystemExit (e.g. a missing optional dependency): the thread
+            # excepthook would drop it silently and leave the display loop waiting
+            with slot_lock:
+                slot["error"] = e
+            ready.set()
+
+    overlay = _FpsOverlay(label, title)
+    worker = threading.Thread(target=producer, daemon=True)
+    worker.start()
+    try:
+        while True:
+            if ready.wait(timeout=0.05):
+                with slot_lock:
+                    # Taking the frame (clearing ready) hands the other buffer to the producer
+                    ready.clear()
+                    frame, fps, error = slot["frame"], slot["fps"], slot["error"]
+                if error is not None:
+                    raise error
+                cv2.imshow("Capture Preview", overlay.apply(frame, fps))
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+    finally:
+        running.clear()
+        worker.join()
+        cv2.destroyAllWindows()
 
 def run(backend: str, title_contains: str, preview: bool, save_path: Optional[str]) -> None:
     info: Optional[WindowInfo] = find_window(title_contains=title_contains)
     if info is None:
         raise SystemExit(f"Window not found containing title: {title_contains}")
 
-    if backend == "mss":
+    if backend in ("mss", "dxgi"):
+        label = backend.upper()
         if not ensure_foreground(info.hwnd):
-            print("Warning: could not force foreground; MSS requires unobstructed window.")
+            print(f"Warning: could not force foreground; {label} requires unobstructed window.")
         bbox = get_capture_bbox(info)
-        cap = MSSCapture()
+        if backend == "dxgi":
+            # Imported lazily so the other backends work without dxcam installed, but
+            # here on the main thread so a missing dxcam exits before any preview starts
+            from .capture_dxgi import DXGICapture
+
+        def make_cap():
+            if backend == "dxgi":
+                return DXGICapture()
+            return MSSCapture(bbox_hint=bbox)
+
         if save_path:
+            cap = make_cap()
             frame = cap.grab(bbox)
             Path(save_path).parent.mkdir(parents=True, exist_ok=True)
             cv2.imwrite(save_path, frame)
             print(f"Saved: {save_path}")
             return
         if preview:
-            t0 = time.perf_counter()
-            frames = 0
-            while True:
-                frame = cap.grab(bbox)
-                frames += 1
-                elapsed = time.perf_counter() - t0
-                fps = frames / elapsed if elapsed > 0 else 0.0
-                disp = _overlay_fps(frame, fps, "MSS", info.title)
-                cv2.imshow("Capture Preview", disp)
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
-            cv2.destroyAllWindows()
+            _preview(make_cap, lambda cap: cap.grab(bbox), label, info.title)
         else:
-            frame = cap.grab(bbox)
-            print(f"Captured frame: {frame.shape[11]}x{frame.shape} via MSS")
+            # Size is known from the bbox; no need to grab a frame just to print it
+            print(f"Would capture {bbox[2]}x{bbox[3]} via {label} (use --save or --preview)")
     elif backend == "win32":
-        cap = Win32ClientCapture(info.hwnd)
         if save_path:
-            frame = cap.grab()
+            frame = Win32ClientCapture(info.hwnd).grab()
             Path(save_path).parent.mkdir(parents=True, exist_ok=True)
             cv2.imwrite(save_path, frame)
             print(f"Saved: {save_path}")
             return
         if preview:
-            t0 = time.perf_counter()
-            frames = 0
-            while True:
-                frame = cap.grab()
-                frames += 1
-                elapsed = time.perf_counter() - t0
-                fps = frames / elapsed if elapsed > 0 else 0.0
-                disp = _overlay_fps(frame, fps, "Win32", info.title)
-                cv2.imshow("Capture Preview", disp)
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
-            cv2.destroyAllWindows()
+            _preview(lambda: Win32ClientCapture(info.hwnd), lambda cap: cap.grab(), "Win32", info.title)
         else:
-            frame = cap.grab()
-            print(f"Captured frame: {frame.shape[11]}x{frame.shape} via Win32")
+            _, _, w, h = get_capture_bbox(info)
+            print(f"Would capture {w}x{h} via Win32 (use --save or --preview)")
     else:
-        raise SystemExit("Unknown backend. Use --backend mss or --backend win32")
+        raise SystemExit("Unknown backend. Use --backend mss, dxgi or win32")
 
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--backend", choices=["mss", "win32"], default="mss")
+    ap.add_argument("--backend", choices=["mss", "dxgi", "win32"], default="mss")
     ap.add_argument("--title", default="MTA: San Andreas")
     ap.add_argument("--save", default=None)
     ap.add_argument("--preview", action="store_true")
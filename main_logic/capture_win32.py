@@ -7,7 +7,7 @@ Requires: pywin32, numpy, opencv-python
 
 from __future__ import annotations
 
-from typing import Tuple
+from typing import Optional, Tuple
 import numpy as np
 
 try:
@@ -32,6 +32,23 @@ class Win32ClientCapture:
         except Exception:
             pass
         self.hwnd = hwnd
+        # GDI objects are created on first grab() and kept until close();
+        # only the bitmap is recreated when the client size changes.
+        self._hwnd_dc = None
+        self._mfc_dc = None
+        self._save_dc = None
+        self._bitmap = None
+        self._bmp_size: Tuple[int, int] = (0, 0)
+        # PrintWindow flag that last succeeded (stable per window)
+        self._pw_flag: Optional[int] = None
+        # Reused BGR output buffer, sized to the client area
+        self._bgr: Optional[np.ndarray] = None
+        try:
+            w, h = self._client_size()
+            if w > 0 and h > 0:
+                self._bgr = np.empty((h, w, 3), dtype=np.uint8)
+        except RuntimeError:
+            pass
 
     def _client_size(self) -> Tuple[int, int]:
         rect = wintypes.RECT()
@@ -41,38 +58,78 @@ class Win32ClientCapture:
         h = int(rect.bottom - rect.top)
         return w, h
 
+    def _ensure_gdi(self, w: int, h: int) -> None:
+        if self._hwnd_dc is None:
+            self._hwnd_dc = win32gui.GetWindowDC(self.hwnd)
+            self._mfc_dc = win32ui.CreateDCFromHandle(self._hwnd_dc)
+            self._save_dc = self._mfc_dc.CreateCompatibleDC()
+        if self._bitmap is None or self._bmp_size != (w, h):
+            bitmap = win32ui.CreateBitmap()
+            bitmap.CreateCompatibleBitmap(self._mfc_dc, w, h)
+            self._save_dc.SelectObject(bitmap)
+            if self._bitmap is not None:
+                win32gui.DeleteObject(self._bitmap.GetHandle())
+            self._bitmap = bitmap
+            self._bmp_size = (w, h)
+
+    def close(self) -> None:
+        """Release cached GDI objects."""
+        if self._bitmap is not None:
+            win32gui.DeleteObject(self._bitmap.GetHandle())
+            self._bitmap = None
+        if self._save_dc is not None:
+            self._save_dc.DeleteDC()
+            self._save_dc = None
+        if self._mfc_dc is not None:
+            self._mfc_dc.DeleteDC()
+            self._mfc_dc = None
+        if self._hwnd_dc is not None:
+            win32gui.ReleaseDC(self.hwnd, self._hwnd_dc)
+            self._hwnd_dc = None
+        self._bmp_size = (0, 0)
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _print_window(self, hdc: int) -> int:
+        if self._pw_flag is not None:
+            result = windll.user32.PrintWindow(self.hwnd, hdc, self._pw_flag)
+            if result == 1:
+                return result
+            self._pw_flag = None
+        # Try multiple PrintWindow flags; some apps behave differently
+        result = 0
+        for flag in (3, 2, 1):
+            result = windll.user32.PrintWindow(self.hwnd, hdc, flag)
+            if result == 1:
+                self._pw_flag = flag
+                break
+        return result
+
     def grab(self) -> np.ndarray:
+        """
+        Capture the client area as a BGR frame. The returned array is an internal
+        buffer that is overwritten by the next grab(); copy it if it must be kept.
+        """
         w, h = self._client_size()
         if w <= 0 or h <= 0:
             raise RuntimeError("Zero-sized client area; minimized?")
 
-        hwnd_dc = win32gui.GetWindowDC(self.hwnd)
-        mfc_dc = win32ui.CreateDCFromHandle(hwnd_dc)
-        save_dc = mfc_dc.CreateCompatibleDC()
-        bitmap = win32ui.CreateBitmap()
-        bitmap.CreateCompatibleBitmap(mfc_dc, w, h)
-        save_dc.SelectObject(bitmap)
-
-        # Try multiple PrintWindow flags; some apps behave differently
-        result = windll.user32.PrintWindow(self.hwnd, save_dc.GetSafeHdc(), 3)
-        if result != 1:
-            result = windll.user32.PrintWindow(self.hwnd, save_dc.GetSafeHdc(), 2)
-            if result != 1:
-                result = windll.user32.PrintWindow(self.hwnd, save_dc.GetSafeHdc(), 1)
-
-        bmpinfo = bitmap.GetInfo()
-        bmpbytes = bitmap.GetBitmapBits(True)
-        img = np.frombuffer(bmpbytes, dtype=np.uint8)
-        img = img.reshape((bmpinfo["bmHeight"], bmpinfo["bmWidth"], 4))[..., :3]  # BGRA->BGR
-        img = np.ascontiguousarray(img)
-
-        # Cleanup GDI objects
-        win32gui.DeleteObject(bitmap.GetHandle())
-        save_dc.DeleteDC()
-        mfc_dc.DeleteDC()
-        win32gui.ReleaseDC(self.hwnd, hwnd_dc)
-
+        self._ensure_gdi(w, h)
+        result = self._print_window(self._save_dc.GetSafeHdc())
+        # GDI objects are cached, so there is nothing to clean up before raising
         if result != 1:
             raise RuntimeError(f"PrintWindow failed or returned {result}")
 
-        return img
+        bmpinfo = self._bitmap.GetInfo()
+        bmpbytes = self._bitmap.GetBitmapBits(True)
+        bh, bw = bmpinfo["bmHeight"], bmpinfo["bmWidth"]
+        bgra = np.frombuffer(bmpbytes, dtype=np.uint8).reshape((bh, bw, 4))
+
+        if self._bgr is None or self._bgr.shape[:2] != (bh, bw):
+            self._bgr = np.empty((bh, bw, 3), dtype=np.uint8)
+        cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=self._bgr)  # BGRA->BGR, contiguous in one pass
+        return self._bgr
@@ -7,6 +7,7 @@ Press ESC to quit.
 
 usage
 python -m main_logic.hotkey_capture --title "MTA: San Andreas" --delay-ms 30 --save-dir screenshots
+python -m main_logic.hotkey_capture --fmt bmp   # uncompressed, cheapest to write
 
 
 """
@@ -14,10 +15,11 @@ python -m main_logic.hotkey_capture --title "MTA: San Andreas" --delay-ms 30 --s
 from __future__ import annotations
 
 import argparse
+import queue
 import threading
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 import numpy as np
 
@@ -38,6 +40,9 @@ except ImportError as e:
 
 from .window_finder import find_window, get_capture_bbox, ensure_foreground, WindowInfo
 
+# Virtual-key codes for Alt (generic/left/right), Q, E and ESC
+_WATCHED_VKS = frozenset((0x12, 0xA4, 0xA5, 0x51, 0x45, 0x1B))
+
 
 class KeypressCapture:
     def __init__(
@@ -46,8 +51,12 @@ class KeypressCapture:
         save_dir: str,
         post_press_delay_ms: int = 0,
         bring_foreground: bool = True,
+        image_format: str = "png",
     ) -> None:
+        if image_format not in ("png", "bmp"):
+            raise SystemExit(f"Unsupported image format: {image_format}")
         self.title_contains = title_contains
+        self.image_format = image_format
         self.post_press_delay_ms = max(0, int(post_press_delay_ms))
         self.save_dir = Path(save_dir)
         self.save_dir.mkdir(parents=True, exist_ok=True)
@@ -62,15 +71,37 @@ class KeypressCapture:
 
         self._lock = threading.Lock()
         self._counter = 0
-        self._running = True
+        self._stop = threading.Event()
 
         # Cycle tracking: Alt=1, Q/E=2, Q/E=3, Q/E=4, then reset on next Alt
         self._cycle_position = 0  # 0 = waiting for alt, 1-4 = positions in cycle
         self._total_screenshots = 0
 
-        self._last_ts = {"alt": 0.0, "q": 0.0, "e": 0.0}
+        # Last accepted press per key (debounce)
+        self._last_alt = 0.0
+        self._last_q = 0.0
+        self._last_e = 0.0
         self._debounce_s = 0.08
 
+        # One persistent MSS instance per listener thread (MSS handles are thread-bound)
+        self._tls = threading.local()
+        self._scts = []
+
+        # Capture region is resolved once and kept fresh by a low-frequency poller
+        # None while the window is unavailable; the reason is kept to warn once per change
+        self._monitor: Optional[dict] = None
+        self._unavailable: Optional[str] = None
+        self._bbox_refresh_s = 0.5
+        try:
+            self._monitor = self._make_monitor(get_capture_bbox(self.info))
+        except RuntimeError as e:
+            self._set_unavailable(str(e))
+
+        # Image encoding/writing runs on a worker so the key listener never blocks on disk
+        self._save_q: queue.Queue = queue.Queue(maxsize=32)
+        self._save_thread = threading.Thread(target=self._save_worker, daemon=True)
+        self._save_thread.start()
+
     def _now_ms(self) -> int:
         return int(time.time() * 1000)
 
@@ -88,20 +119,86 @@ class KeypressCapture:
             
             return self._cycle_position
 
+    def _get_sct(self):
+        """Return this thread's MSS instance, creating it on first use"""
+        sct = getattr(self._tls, "sct", None)
+        if sct is None:
+            sct = mss.mss()
+            self._tls.sct = sct
+            with self._lock:
+                self._scts.append(sct)
+        return sct
+
+    def _close_thread_sct(self) -> None:
+        """Close the calling thread's MSS instance, on the thread that owns it"""
+        sct = getattr(self._tls, "sct", None)
+        if sct is None:
+            return
+        self._tls.sct = None
+        with self._lock:
+            if sct in self._scts:
+                self._scts.remove(sct)
+        try:
+            sct.close()
+        except Exception as e:
+            print(f"[warn] closing MSS instance failed: {e}")
+
+    def _close_scts(self) -> None:
+        """Best-effort close of instances whose owning thread did not clean up"""
+        with self._lock:
+            scts, self._scts = self._scts, []
+        for sct in scts:
+            try:
+                sct.close()
+            except Exception as e:
+                print(f"[warn] closing MSS instance from another thread failed: {e}")
+
+    @staticmethod
+    def _make_monitor(bbox: Tuple[int, int, int, int]) -> dict:
+        return {"left": bbox[0], "top": bbox[1], "width": bbox[2], "height": bbox[3]}
+
+    def _set_unavailable(self, reason: Optional[str]) -> None:
+        """Record capture availability; print only when it changes"""
+        if reason == self._unavailable:
+            return
+        if reason is None:
+            print("[info] window available again; capture resumed")
+        else:
+            print(f"[warn] window unavailable, captures skipped: {reason}")
+        self._unavailable = reason
+
+    def _refresh_monitor(self) -> None:
+        """Re-resolve the window and update the cached capture region"""
+        info = find_window(title_contains=self.title_contains)
+        if info is None:
+            raise RuntimeError(f"window not found: {self.title_contains}")
+        monitor = self._make_monitor(get_capture_bbox(info))
+        with self._lock:
+            self.info = info
+            self._monitor = monitor
+
+    def _bbox_poller(self) -> None:
+        while not self._stop.wait(self._bbox_refresh_s):
+            try:
+                self._refresh_monitor()
+            except Exception as e:
+                # Never capture at stale coordinates of a minimized/closed window
+                self._monitor = None
+                self._set_unavailable(str(e))
+            else:
+                self._set_unavailable(None)
+
     def _safe_grab(self) -> Optional[np.ndarray]:
-        """Thread-safe capture using fresh MSS context manager"""
+        """Thread-safe capture using a persistent per-thread MSS instance"""
         try:
-            bbox = get_capture_bbox(self.info)
-            with mss.mss() as sct:
-                monitor = {
-                    "left": bbox[0], 
-                    "top": bbox[1], 
-                    "width": bbox[2], 
-                    "height": bbox[3]
-                }
-                screenshot = sct.grab(monitor)
-            frame = np.asarray(screenshot, dtype=np.uint8)[..., :3]
-            return frame
+            monitor = self._monitor
+            if monitor is None:
+                raise RuntimeError(f"window unavailable ({self._unavailable or 'no capture bbox'})")
+            screenshot = self._get_sct().grab(monitor)
+            bgra = np.frombuffer(screenshot.raw, dtype=np.uint8)
+            bgra = bgra.reshape(screenshot.height, screenshot.width, 4)
+            # Fresh contiguous array per grab: frames are queued for the save worker
+            return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR)
         except Exception as e:
             print(f"[warn] capture failed: {e}")
             return None
@@ -112,18 +209,52 @@ class KeypressCapture:
             self._total_screenshots += 1
             total_idx = self._total_screenshots
         
-        # Filename: {cycle_position}_{keyname}_{timestamp}_{total_index}.png
-        fname = f"{cycle_pos}_{keyname}_{ts}_{total_idx:04d}.png"
+        # Filename: {cycle_position}_{keyname}_{timestamp}_{total_index}.{png|bmp}
+        fname = f"{cycle_pos}_{keyname}_{ts}_{total_idx:04d}.{self.image_format}"
         path = self.save_dir / fname
-        cv2.imwrite(str(path), frame)
+        item = (frame, str(path))
+        try:
+            self._save_q.put_nowait(item)
+        except queue.Full:
+            # Drop the oldest pending frame rather than stall the listener
+            try:
+                dropped = self._save_q.get_nowait()
+                print(f"[warn] save queue full; dropped {dropped[1]}")
+            except queue.Empty:
+                pass
+            self._save_q.put_nowait(item)
         return str(path)
 
+    def _save_worker(self) -> None:
+        while True:
+            item = self._save_q.get()
+            if item is None:
+                return
+            frame, path = item
+            try:
+                # BMP is uncompressed: no zlib pass, one straight write
+                ok, buf = cv2.imencode(f".{self.image_format}", frame)
+                if not ok:
+                    raise RuntimeError("imencode failed")
+                # Straight from the encode buffer to disk, no Python file object
+                buf.tofile(path)
+            except Exception as e:
+                print(f"[warn] save failed for {path}: {e}")
+
     def _handle_keypress(self, keyname: str) -> None:
         now = time.perf_counter()
-        last = self._last_ts.get(keyname, 0.0)
-        if (now - last) < self._debounce_s:
-            return
-        self._last_ts[keyname] = now
+        if keyname == "alt":
+            if (now - self._last_alt) < self._debounce_s:
+                return
+            self._last_alt = now
+        elif keyname == "q":
+            if (now - self._last_q) < self._debounce_s:
+                return
+            self._last_q = now
+        else:
+            if (now - self._last_e) < self._debounce_s:
+                return
+            self._last_e = now
 
         if self.post_press_delay_ms > 0:
             time.sleep(self.post_press_delay_ms / 1000.0)
@@ -152,19 +283,38 @@ class KeypressCapture:
                     self._handle_keypress("alt")
                 elif key == keyboard.Key.esc:
                     print("[info] ESC detected; exiting.")
-                    self._running = False
-                    # Do not return anything; just set _running to False
+                    self._stop.set()
+                    # Captures run on this listener thread; release its MSS handle here
+                    self._close_thread_sct()
+                    # Do not return anything; just signal the stop event
         except Exception as exc:
             print(f"[err] on_press error: {exc}")
         # Always return None implicitly
 
+    @staticmethod
+    def _win32_event_filter(msg, data) -> bool:
+        """Drop every key but Alt/Q/E/ESC inside the hook, before pynput translates it"""
+        return data.vkCode in _WATCHED_VKS
+
     def run(self) -> None:
         print("[info] Listening for Alt / Q / E ... (ESC to quit)")
         print("[info] Cycle: Alt=1, Q/E=2, Q/E=3, Q/E=4, then repeats")
-        with keyboard.Listener(on_press=self.on_press) as listener:
-            while self._running:
-                time.sleep(0.05)
-            listener.stop()
+        poller = threading.Thread(target=self._bbox_poller, daemon=True)
+        poller.start()
+        try:
+            with keyboard.Listener(
+                on_press=self.on_press,
+                win32_event_filter=self._win32_event_filter,
+            ) as listener:
+                # Wakes immediately on ESC; the timeout keeps Ctrl+C responsive on Windows
+                while not self._stop.wait(0.5):
+                    pass
+                listener.stop()
+        finally:
+            self._close_scts()
+            # Flush pending saves before exiting
+            self._save_q.put(None)
+            self._save_thread.join()
 
 
 def main():
@@ -173,6 +323,7 @@ def main():
     ap.add_argument("--save-dir", default="screenshots")
     ap.add_argument("--delay-ms", type=int, default=0)
     ap.add_argument("--no-foreground", action="store_true")
+    ap.add_argument("--fmt", choices=["png", "bmp"], default="png")
     args = ap.parse_args()
 
     kc = KeypressCapture(
@@ -180,6 +331,7 @@ def main():
         save_dir=args.save_dir,
         post_press_delay_ms=args.delay_ms,
         bring_foreground=(not args.no_foreground),
+        image_format=args.fmt,
     )
     kc.run()
 
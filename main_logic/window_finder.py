@@ -2,112 +2,326 @@
 """
 Window discovery and client-area bbox computation for MTA: San Andreas.
 Exports: WindowInfo, find_window, ensure_foreground, get_capture_bbox
+Requires: Windows, Python 3.10+ (slotted dataclasses). user32 is called via ctypes.
 """
 
 from __future__ import annotations
 
+import threading
 import time
-from dataclasses import dataclass
-from typing import Tuple, List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Tuple, List, Optional
 
+import ctypes
+from ctypes import POINTER, create_unicode_buffer, wintypes
+
+__all__ = ["WindowInfo", "find_window", "ensure_foreground", "get_capture_bbox"]
+
+_HWND_DESKTOP = None
+
+# Private user32 handle with prototypes bound once, so calls take ctypes' fast path
+# (and windll.user32, shared with other modules, is left untouched).
 try:
-    import win32con
-    import win32gui
-    import win32process
-except ImportError as e:
-    raise SystemExit("pywin32 is required: pip install pywin32") from e
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _WNDENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+except (AttributeError, OSError) as e:
+    raise SystemExit("window_finder requires Windows (user32.dll)") from e
+for _name, _argtypes, _restype in (
+    ("EnumWindows", [_WNDENUMPROC, wintypes.LPARAM], wintypes.BOOL),
+    ("FindWindowW", [wintypes.LPCWSTR, wintypes.LPCWSTR], wintypes.HWND),
+    ("GetClassNameW", [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int], ctypes.c_int),
+    ("GetClientRect", [wintypes.HWND, POINTER(wintypes.RECT)], wintypes.BOOL),
+    ("GetWindowRect", [wintypes.HWND, POINTER(wintypes.RECT)], wintypes.BOOL),
+    ("MapWindowPoints", [wintypes.HWND, wintypes.HWND, POINTER(wintypes.RECT), wintypes.UINT], ctypes.c_int),
+    ("IsWindow", [wintypes.HWND], wintypes.BOOL),
+    ("IsIconic", [wintypes.HWND], wintypes.BOOL),
+    ("IsWindowVisible", [wintypes.HWND], wintypes.BOOL),
+    ("GetWindowTextLengthW", [wintypes.HWND], ctypes.c_int),
+    ("GetWindowTextW", [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int], ctypes.c_int),
+    ("SetProcessDPIAware", [], wintypes.BOOL),
+    ("GetForegroundWindow", [], wintypes.HWND),
+    ("SwitchToThisWindow", [wintypes.HWND, wintypes.BOOL], None),
+    ("GetWindowThreadProcessId", [wintypes.HWND, POINTER(wintypes.DWORD)], wintypes.DWORD),
+):
+    _fn = getattr(_user32, _name)
+    _fn.argtypes = _argtypes
+    _fn.restype = _restype
+del _name, _argtypes, _restype, _fn
 
-from ctypes import windll, byref, wintypes
+def _nonzero(result, func, args):
+    """errcheck for BOOL APIs: raise OSError (WinError from GetLastError) on failure."""
+    if not result:
+        raise ctypes.WinError(ctypes.get_last_error())
+    return result
 
-__all__ = ["WindowInfo", "find_window", "ensure_foreground", "get_capture_bbox"]
+# Failure checks live out of line in errcheck; callers just make the call
+_user32.GetClientRect.errcheck = _nonzero
+_user32.GetWindowRect.errcheck = _nonzero
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WindowInfo:
     hwnd: int
     title: str
-    pid: int
     is_visible: bool
     is_minimized: bool
-    client_bbox: Tuple[int, int, int, int]  # left, top, width, height (screen coords)
+    # Client-area bbox in screen coords, stored as plain ints (no per-refresh tuple)
+    bbox_l: int
+    bbox_t: int
+    bbox_w: int
+    bbox_h: int
+    # Resolved on first access of .pid; most callers never need it
+    _pid: Optional[int] = field(default=None, repr=False, compare=False)
+
+    @property
+    def pid(self) -> int:
+        if self._pid is None:
+            # Lazy cache slot on a frozen instance; excluded from eq/hash
+            object.__setattr__(self, "_pid", _get_pid(self.hwnd))
+        return self._pid
+
+    @property
+    def client_bbox(self) -> Tuple[int, int, int, int]:
+        """left, top, width, height (screen coords)"""
+        return self.bbox_l, self.bbox_t, self.bbox_w, self.bbox_h
+
+@dataclass(slots=True)
+class _CacheEntry:
+    info: WindowInfo
+    window_rect: Tuple[int, int, int, int]  # GetWindowRect when info was built
+    stamp: float  # time.monotonic() when info was built
+
+# Last resolved window per title_contains; revalidated cheaply before reuse
+_CACHE: Dict[str, _CacheEntry] = {}
+# Back-to-back callers (any thread) within this window share one resolution
+_CACHE_TTL_S = 0.1
+_FIND_LOCK = threading.Lock()
+# Window class of the last usable match per title_contains, for FindWindowW lookups
+_CLASS_HINTS: Dict[str, str] = {}
+
+_DPI_SET = False
+_DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE_V2 = -4
 
 def _set_dpi_aware() -> None:
+    """
+    Make the process per-monitor DPI aware so client rects are in physical pixels
+    on mixed-DPI setups. Tries PMv2 (Win10 1703+), then shcore PMv1, then the legacy
+    system-aware call. Runs once per process.
+    """
+    global _DPI_SET
+    if _DPI_SET:
+        return
+    _DPI_SET = True
     try:
-        windll.user32.SetProcessDPIAware()
+        ctx = ctypes.c_void_p(_DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE_V2)
+        if _user32.SetProcessDpiAwarenessContext(ctx):
+            return
+    except (AttributeError, OSError):
+        pass
+    try:
+        if ctypes.WinDLL("shcore").SetProcessDpiAwareness(2) == 0:  # PROCESS_PER_MONITOR_DPI_AWARE
+            return
+    except (AttributeError, OSError):
+        pass
+    try:
+        _user32.SetProcessDPIAware()
     except Exception:
         pass
 
+# Per-thread RECT (and pointer to it) and PID DWORD reused across bbox queries;
+# find_window is called from both the main thread and capture worker threads.
+_tls = threading.local()
+
+def _rect_buf(slot: str = "rect") -> Tuple[wintypes.RECT, ctypes._Pointer]:
+    buf = getattr(_tls, slot, None)
+    if buf is None:
+        rect = wintypes.RECT()
+        buf = (rect, ctypes.pointer(rect))
+        setattr(_tls, slot, buf)
+    return buf
+
+def _get_window_rect(hwnd: int) -> Tuple[int, int, int, int]:
+    """Outer window rect (left, top, right, bottom); one call, no coordinate mapping."""
+    rect, prect = _rect_buf("wrect")
+    _user32.GetWindowRect(hwnd, prect)
+    return rect.left, rect.top, rect.right, rect.bottom
+
 def _get_client_rect_screen(hwnd: int) -> Tuple[int, int, int, int]:
-    rect = wintypes.RECT()
-    if not windll.user32.GetClientRect(hwnd, byref(rect)):
-        raise RuntimeError("GetClientRect failed")
-    pt_ul = wintypes.POINT(rect.left, rect.top)
-    pt_br = wintypes.POINT(rect.right, rect.bottom)
-    if not windll.user32.ClientToScreen(hwnd, byref(pt_ul)):
-        raise RuntimeError("ClientToScreen(ul) failed")
-    if not windll.user32.ClientToScreen(hwnd, byref(pt_br)):
-        raise RuntimeError("ClientToScreen(br) failed")
-    left = int(pt_ul.x)
-    top = int(pt_ul.y)
-    width = int(pt_br.x - pt_ul.x)
-    height = int(pt_br.y - pt_ul.y)
+    rect, prect = _rect_buf()
+    _user32.GetClientRect(hwnd, prect)
+    # Both corners to screen coords in one call (the RECT is two POINTs)
+    _user32.MapWindowPoints(hwnd, _HWND_DESKTOP, prect, 2)
+    left = int(rect.left)
+    top = int(rect.top)
+    width = int(rect.right - rect.left)
+    height = int(rect.bottom - rect.top)
     return left, top, width, height
 
-def _is_minimized(hwnd: int) -> bool:
-    return bool(win32gui.IsIconic(hwnd))
-
-def _is_visible(hwnd: int) -> bool:
-    return bool(win32gui.IsWindowVisible(hwnd))
+# Direct bound handles (return BOOL as int); cast with bool() only where stored
+_is_minimized = _user32.IsIconic
+_is_visible = _user32.IsWindowVisible
+_get_fg = _user32.GetForegroundWindow
+_FG_SPIN = 20
 
 def _get_pid(hwnd: int) -> int:
-    _, pid = win32process.GetWindowThreadProcessId(hwnd)
-    return int(pid)
+    pid = getattr(_tls, "pid", None)
+    if pid is None:
+        pid = _tls.pid = wintypes.DWORD()
+    _user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    return int(pid.value)
+
+def _get_title(hwnd: int, length: int) -> str:
+    buf = create_unicode_buffer(length + 1)
+    _user32.GetWindowTextW(hwnd, buf, length + 1)
+    return buf.value
+
+def _match_title(hwnd: int, needle_lc: str) -> Optional[str]:
+    """
+    Return the window title if it contains needle_lc (already casefolded), else None.
+    """
+    length = _user32.GetWindowTextLengthW(hwnd)
+    # casefold() expands a char to at most 3 ("ß" -> "ss"), so a title shorter than
+    # a third of the folded needle cannot match: skip it without fetching the string
+    if length <= 0 or 3 * length < len(needle_lc):
+        return None
+    title = _get_title(hwnd, length)
+    return title if title.casefold().find(needle_lc) >= 0 else None
+
+# (hwnd, title, is_visible, is_minimized) as observed while matching
+_Match = Tuple[int, str, bool, bool]
+
+# Enumeration state shared with _enum_cb: [needle_lc, usable_only, result].
+# Only touched from _find_first, which runs under _FIND_LOCK.
+_enum_state: List = [None, False, None]
 
-def _enum_windows() -> List[int]:
-    hwnds: List[int] = []
-    def _cb(h, _):
-        hwnds.append(int(h))
+def _enum_cb(hwnd, lparam):
+    needle_lc, usable_only, _ = _enum_state
+    if usable_only and (not _is_visible(hwnd) or _is_minimized(hwnd)):
         return True
-    win32gui.EnumWindows(_cb, None)
-    return hwnds
+    title = _match_title(hwnd, needle_lc)
+    if title is None:
+        return True
+    if usable_only:
+        _enum_state[2] = (hwnd, title, True, False)
+    else:
+        _enum_state[2] = (hwnd, title, bool(_is_visible(hwnd)), bool(_is_minimized(hwnd)))
+    return False  # stop enumeration
 
-def _match_title(hwnd: int, needle: str) -> bool:
-    try:
-        title = win32gui.GetWindowText(hwnd) or ""
-        return needle.lower() in title.lower()
-    except Exception:
-        return False
+# C thunk built once at import rather than per EnumWindows call
+_ENUM_CB_C = _WNDENUMPROC(_enum_cb)
+
+def _find_first(needle_lc: str) -> Optional[_Match]:
+    """
+    EnumWindows pass that stops at the first visible, non-minimized title match.
+    Visibility is checked before the title so hidden windows never allocate a string.
+    Only if that finds nothing, a second pass returns the first title match in any state.
+    """
+    for usable_only in (True, False):
+        _enum_state[:] = [needle_lc, usable_only, None]
+        _user32.EnumWindows(_ENUM_CB_C, 0)
+        if _enum_state[2] is not None:
+            return _enum_state[2]
+    return None
 
-def find_window(title_contains: str = "MTA: San Andreas") -> Optional[WindowInfo]:
+def find_window(
+    title_contains: str = "MTA: San Andreas",
+    class_hint: Optional[str] = None,
+) -> Optional[WindowInfo]:
     """
     Locate a top-level window whose title contains the given substring.
     Prefer a visible, non-minimized window. Returns WindowInfo or None.
+    class_hint: window class to try with FindWindowW before enumerating. If omitted,
+    the class of the window last found for this title is used.
     """
-    _set_dpi_aware()
-    all_hwnds: List[int] = _enum_windows()
-    matches: List[int] = [h for h in all_hwnds if _match_title(h, title_contains)]
-    if not matches:
+    with _FIND_LOCK:
+        entry = _CACHE.get(title_contains)
+        if (
+            entry is not None
+            and (time.monotonic() - entry.stamp) < _CACHE_TTL_S
+            and _user32.IsWindow(entry.info.hwnd)
+        ):
+            return entry.info
+        return _resolve_window(title_contains, class_hint)
+
+def _find_by_class(class_name: str, needle_lc: str) -> Optional[_Match]:
+    """O(1) FindWindowW lookup; accepted only if it is a usable, title-matching window."""
+    hwnd = _user32.FindWindowW(class_name, None)
+    if not hwnd or not _is_visible(hwnd) or _is_minimized(hwnd):
         return None
+    title = _match_title(hwnd, needle_lc)
+    return (hwnd, title, True, False) if title is not None else None
 
-    # Build filtered candidates; select exactly one element for hwnd
-    usable: List[int] = [h for h in matches if _is_visible(h) and not _is_minimized(h)]
-    hwnd: int = (usable[0] if len(usable) > 0 else matches[0])
+def _get_class_name(hwnd: int) -> str:
+    buf = create_unicode_buffer(256)  # max class name length
+    _user32.GetClassNameW(hwnd, buf, 256)
+    return buf.value
+
+def _resolve_window(title_contains: str, class_hint: Optional[str] = None) -> Optional[WindowInfo]:
+    _set_dpi_aware()
+    needle_lc = title_contains.casefold()
+    match: Optional[_Match] = None
+    wrect: Optional[Tuple[int, int, int, int]] = None
+    entry = _CACHE.get(title_contains)
+    cached = entry.info if entry is not None else None
+    if (
+        cached is not None
+        and _user32.IsWindow(cached.hwnd)
+        and _is_visible(cached.hwnd)
+        and not _is_minimized(cached.hwnd)
+    ):
+        title = _match_title(cached.hwnd, needle_lc)
+        if title is not None:
+            # Still the right, usable window: skip the EnumWindows sweep
+            match = (cached.hwnd, title, True, False)
+            try:
+                wrect = _get_window_rect(cached.hwnd)
+            except OSError:
+                wrect = None
+            if (
+                wrect == entry.window_rect
+                and title == cached.title
+                and cached.is_visible
+                and not cached.is_minimized
+            ):
+                # Window hasn't moved or resized: cached client bbox is still valid
+                entry.stamp = time.monotonic()
+                return cached
+    if match is None:
+        hint = class_hint or _CLASS_HINTS.get(title_contains)
+        if hint:
+            match = _find_by_class(hint, needle_lc)
+    if match is None:
+        match = _find_first(needle_lc)
+        if match is None:
+            _CACHE.pop(title_contains, None)
+            return None
+        if match[2] and not match[3]:
+            # Remember the class so the next miss can try FindWindowW first
+            _CLASS_HINTS[title_contains] = _get_class_name(match[0])
 
-    title: str = win32gui.GetWindowText(hwnd) or title_contains
-    visible: bool = _is_visible(hwnd)
-    minimized: bool = _is_minimized(hwnd)
+    # State was captured while matching; nothing is re-queried here
+    hwnd, title, visible, minimized = match
     try:
-        bbox = _get_client_rect_screen(hwnd)
+        if wrect is None:
+            wrect = _get_window_rect(hwnd)
+        l, t, w, h = _get_client_rect_screen(hwnd)
     except Exception:
-        bbox = (0, 0, 0, 0)
+        l = t = w = h = 0
 
-    return WindowInfo(
+    info = WindowInfo(
         hwnd=hwnd,
         title=title,
-        pid=_get_pid(hwnd),
         is_visible=visible,
         is_minimized=minimized,
-        client_bbox=bbox,
+        bbox_l=l,
+        bbox_t=t,
+        bbox_w=w,
+        bbox_h=h,
     )
+    if w > 0 and h > 0:
+        _CACHE[title_contains] = _CacheEntry(info, wrect, time.monotonic())
+    else:
+        _CACHE.pop(title_contains, None)
+    return info
 
 def ensure_foreground(hwnd: int, retries: int = 5, sleep_s: float = 0.05) -> bool:
     """
@@ -115,11 +329,14 @@ def ensure_foreground(hwnd: int, retries: int = 5, sleep_s: float = 0.05) -> boo
     """
     try:
         for _ in range(retries):
-            if win32gui.IsIconic(hwnd):
-                win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-            win32gui.SetForegroundWindow(hwnd)
+            # Restores (if minimized) and activates in one user32 call, like Alt+Tab
+            _user32.SwitchToThisWindow(hwnd, True)
+            # The switch usually lands almost immediately; poll briefly before sleeping
+            for _ in range(_FG_SPIN):
+                if _get_fg() == hwnd:
+                    return True
             time.sleep(sleep_s)
-            if win32gui.GetForegroundWindow() == hwnd:
+            if _get_fg() == hwnd:
                 return True
     except Exception:
         return False
@@ -129,7 +346,6 @@ def get_capture_bbox(info: WindowInfo) -> Tuple[int, int, int, int]:
     """
     Return the client-area bbox in screen coordinates (left, top, width, height).
     """
-    l, t, w, h = info.client_bbox
-    if w <= 0 or h <= 0:
+    if info.bbox_w <= 0 or info.bbox_h <= 0:
         raise RuntimeError("Invalid client bbox; is the window minimized or unavailable?")
-    return l, t, w, h
+    return info.bbox_l, info.bbox_t, info.bbox_w, info.bbox_h